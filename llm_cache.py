@@ -0,0 +1,138 @@
+"""Persistent response cache for LlmAgent model calls.
+
+The research agents issue near-identical prompts every run for the same
+prospect, so repeat runs within the freshness window can skip the model
+round-trip entirely. Responses are keyed by a SHA-256 of the request
+(model, system instruction, contents, tool names) and stored in a local
+SQLite database with a TTL.
+"""
+
+import hashlib
+import json
+import time
+from typing import Dict, Optional, Tuple
+
+import aiosqlite
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+class LLMCache:
+    """SQLite-backed response cache wired in as before/after-model callbacks.
+
+    Usage: pass `before_model_callback=cache.lookup` and
+    `after_model_callback=cache.store` when constructing an LlmAgent.
+    """
+
+    def __init__(self, db_path: str = "llm_cache.db", ttl_seconds: float = 86400):
+        self._db_path = db_path
+        self._ttl = ttl_seconds
+        self._db: Optional[aiosqlite.Connection] = None
+        # Maps (invocation_id, agent_name) -> key computed in lookup(),
+        # so store() writes under the same key without re-hashing.
+        self._pending: Dict[Tuple[str, str], str] = {}
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._db is None:
+            self._db = await aiosqlite.connect(self._db_path)
+            await self._db.execute(_SCHEMA)
+            await self._db.commit()
+        return self._db
+
+    def cache_key(self, llm_request: LlmRequest) -> str:
+        """Builds a deterministic SHA-256 key for a model request."""
+        config = llm_request.config
+        payload = {
+            "model": llm_request.model,
+            "instruction": getattr(config, "system_instruction", None),
+            "temperature": getattr(config, "temperature", None),
+            "tools": sorted(llm_request.tools_dict.keys()),
+            "contents": [
+                part.text
+                for content in llm_request.contents
+                for part in (content.parts or [])
+                if part.text
+            ],
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        db = await self._connection()
+        async with db.execute(
+            "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        response, created_at = row
+        if time.time() - created_at > self._ttl:
+            await db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            await db.commit()
+            return None
+        return response
+
+    async def set(self, key: str, response: str) -> None:
+        db = await self._connection()
+        await db.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+            (key, response, time.time()),
+        )
+        await db.commit()
+
+    async def lookup(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """before_model_callback: returns a cached response on a hit."""
+        # Unset temperature is deliberately treated as cacheable: none of
+        # the agents here set one, and replaying a recent response for the
+        # same prospect is the whole point of this cache, even though the
+        # model's default sampling is not strictly deterministic.
+        if (llm_request.config.temperature or 0) != 0:
+            return None
+        key = self.cache_key(llm_request)
+        cached = await self.get(key)
+        if cached is not None:
+            # On a hit ADK skips after_model_callback entirely, so a pending
+            # entry recorded here would never be popped — don't create one.
+            return LlmResponse.model_validate_json(cached)
+        self._pending[(callback_context.invocation_id, callback_context.agent_name)] = key
+        return None
+
+    async def store(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """after_model_callback: persists fresh final text responses."""
+        # In streaming mode this callback fires for every partial chunk;
+        # leave the pending key in place until the final aggregated
+        # response arrives, and only pop it then.
+        if llm_response.partial:
+            return None
+        key = self._pending.pop(
+            (callback_context.invocation_id, callback_context.agent_name), None
+        )
+        if key is None:
+            return None
+        content = llm_response.content
+        if not content or not content.parts:
+            return None
+        # Never cache tool-call turns: replaying them would skip the
+        # actual tool execution. Each subsequent turn re-keys in lookup().
+        if any(part.function_call for part in content.parts):
+            return None
+        await self.set(key, llm_response.model_dump_json(exclude_none=True))
+        return None
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
@@ -1,17 +1,25 @@
+import aiofiles
 import asyncio
 import os
 import sys
 import time
 import logging
 import json
+import re
+import orjson
 import dotenv
 import urllib.parse
-from typing import Dict, Any, Optional, Tuple
+from pathlib import Path
+from types import MappingProxyType
+from typing import AsyncGenerator, Dict, Any, Optional, Tuple
 
 # Import ADK core components
-from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents import BaseAgent, LlmAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
 from google.adk.tools import google_search, BaseTool
 from google.adk.tools.load_web_page import load_web_page
 from google.adk.agents.callback_context import CallbackContext
@@ -21,7 +29,9 @@ from google.genai import types
 # Import MCP components
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPServerParams
-from google.adk.tools import FunctionTool
+
+from llm_cache import LLMCache
+from sessions import SQLiteSessionService
 
 # --- Configuration ---
 MODEL_NAME = "gemini-2.5-flash"
@@ -51,49 +61,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ADK_Observer")
 
+# Response cache: repeat runs for the same prospect within 24h skip the
+# model round-trip entirely.
+llm_cache = LLMCache(db_path="llm_cache.db", ttl_seconds=86400)
+
+# Intermediate-output dumps go through a bounded queue drained by a
+# background task, so a slow stdout (e.g. a CI log pipe) never blocks an
+# agent's post-hook. Messages are dropped if the queue backs up.
+_LOG_Q: asyncio.Queue = asyncio.Queue(maxsize=64)
+
+async def _drain_log_queue() -> None:
+    while True:
+        message = await _LOG_Q.get()
+        await asyncio.to_thread(sys.stdout.write, message)
+
+# Agent timings live in a plain nested dict (invocation_id -> agent -> t0)
+# instead of session state, which avoids two formatted-string keys and two
+# state-delta writes per agent start/stop.
+_TIMERS: Dict[str, Dict[str, float]] = {}
+
 def on_agent_start(callback_context: CallbackContext) -> None:
     agent_name = callback_context.agent_name
-    invocation_id = callback_context.invocation_id
-    start_time_key = f"metrics:start_time:{invocation_id}:{agent_name}"
-    callback_context.state[start_time_key] = time.time()
+    _TIMERS.setdefault(callback_context.invocation_id, {})[agent_name] = time.perf_counter()
     logger.info(f"▶️  STARTED Agent: {agent_name}")
     return None
 
 def on_agent_end(callback_context: CallbackContext) -> None:
     agent_name = callback_context.agent_name
-    invocation_id = callback_context.invocation_id
-    
+
     # 1. Metrics Calculation
-    start_time_key = f"metrics:start_time:{invocation_id}:{agent_name}"
-    start_time = callback_context.state.get(start_time_key)
+    start_time = _TIMERS.get(callback_context.invocation_id, {}).pop(agent_name, None)
     duration_msg = ""
     if start_time:
-        duration = time.time() - start_time
+        duration = time.perf_counter() - start_time
         duration_msg = f"({duration:.2f}s)"
-    
+
     logger.info(f"⏹️  FINISHED Agent: {agent_name} {duration_msg}")
 
     # 2. Intermediate Output Logging
     # Map agent names to the keys where they store their results
     output_map = {
-        "NewsResearcher": "news_data",
-        "CompetitorResearcher": "competitor_data",
-        "MetricsResearcher": "metrics_data",
-        "TechStackResearcher": "techstack_data",
+        "CompanyResearcher": "research_data",
         "LeadResearcher": "lead_data",
         "PositioningStrategist": "positioning_strategy"
     }
 
-    # If this agent has an output we care about, print it
-    if agent_name in output_map:
+    # If this agent has an output we care about, print it (debug only:
+    # dumping full research outputs to stdout costs real time in CI pipes)
+    if os.environ.get("ADK_DEBUG") and agent_name in output_map:
         state_key = output_map[agent_name]
         # Retrieve the data from the session state
         data = callback_context.state.get(state_key)
         
         if data:
-            print(f"\n{'-'*20} INTERMEDIATE OUTPUT: {agent_name} {'-'*20}")
-            print(str(data).strip())
-            print(f"{'-'*65}\n")
+            message = (
+                f"\n{'-'*20} INTERMEDIATE OUTPUT: {agent_name} {'-'*20}\n"
+                f"{str(data).strip()}\n"
+                f"{'-'*65}\n\n"
+            )
+            try:
+                _LOG_Q.put_nowait(message)
+            except asyncio.QueueFull:
+                pass  # drop the dump rather than stall the agent
 
     return None
 
@@ -101,29 +130,72 @@ def on_tool_start(tool: BaseTool, args: Dict[str, Any], tool_context: ToolContex
     logger.info(f"   🛠️  TOOL CALL: {tool.name} by {tool_context.agent_name}")
     return None
 
+# Value lead_data holds while LeadResearcher is still running; never treated
+# as a cached result.
+_LEAD_PENDING_PLACEHOLDER = "(profile research still in progress)"
+
+# Agents that can be skipped when their output was restored from a previous
+# run's session snapshot.
+_SKIPPABLE_OUTPUTS = {
+    "CompanyResearcher": "research_data",
+    "LeadResearcher": "lead_data",
+    "PositioningStrategist": "positioning_strategy",
+}
+
+def skip_if_cached(callback_context: CallbackContext) -> Optional[types.Content]:
+    """before_agent_callback: skips agents whose output is already in state.
+
+    Returning Content makes ADK treat the agent as answered without running
+    it, so a same-day rerun for the same prospect collapses to just the
+    OutreachWriter step.
+    """
+    output_key = _SKIPPABLE_OUTPUTS.get(callback_context.agent_name)
+    value = callback_context.state.get(output_key) if output_key else None
+    if value and value != _LEAD_PENDING_PLACEHOLDER:
+        logger.info(f"⏭️  SKIPPED Agent: {callback_context.agent_name} (cached {output_key})")
+        return types.Content(
+            role="model",
+            parts=[types.Part(text=f"(restored {output_key} from session cache)")]
+        )
+    return None
+
+# The four state keys downstream instructions interpolate, produced by
+# CompanyResearcher as one JSON blob.
+_RESEARCH_KEYS = ("news_data", "competitor_data", "metrics_data", "techstack_data")
+
+def fan_out_research(callback_context: CallbackContext) -> None:
+    """Splits CompanyResearcher's JSON output into the four research keys."""
+    raw = callback_context.state.get("research_data")
+    if not raw:
+        return None
+    text = str(raw).strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[-1].rsplit("```", 1)[0]
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Could not parse research JSON, passing raw text through: {e}")
+        # Downstream agents still get the full research once, via news_data.
+        data = {"news_data": text}
+    for key in _RESEARCH_KEYS:
+        value = data.get(key, "")
+        callback_context.state[key] = value if isinstance(value, str) else json.dumps(value, indent=2)
+    return None
+
 # --- 1. Agent Instructions ---
-NEWS_INSTRUCTION = """
-You are a News Analyst. Find recent, relevant news about the target company.
-1. Use `Google Search` to find news from the last 6-12 months 
+COMPANY_RESEARCH_INSTRUCTION = """
+You are a Company Research Analyst covering news, competitors, financial metrics and tech stack.
+Use `Google Search` to research the target company across all four areas in one pass:
+1. **News**: recent news from the last 6-12 months
 (launches, funding, expansion, disputes, legal issues, layoffs, M&A, leadership changes, etc.).
-2. Output a bulleted list of the top 3 most relevant news items.
-"""
-COMPETITOR_INSTRUCTION = """
-You are a Market Analyst. Identify the target company's competitive landscape.
-1. Use `Google Search` to identify top 3 direct competitors.
-2. Identify how the target differentiates itself.
-3. Output a summary of their competitive position.
-"""
-METRICS_INSTRUCTION = """
-You are a Financial Analyst. Find key operating metrics.
-1. Use `Google Search` to find: Estimated Revenue, Headcount, Number of Customers, and YoY Growth.
-2. Output a concise summary of their size and stage.
-"""
-TECHSTACK_INSTRUCTION = """
-You are a Technology Investigator. Infer the target company's tech stack. Focus ONLY on paid/vendor tech. DO NOT list open source or common frameworks.
-1. Use `Google Search` to look for job postings or engineering blogs.
-2. Identify key vendor technologies (CRM, Marketing/HR/Financial platforms).
-3. Output a list of identified technologies.
+Pick the top 3 most relevant items as a bulleted list.
+2. **Competitors**: top 3 direct competitors and how the target differentiates itself.
+3. **Metrics**: Estimated Revenue, Headcount, Number of Customers, and YoY Growth - a concise summary of their size and stage.
+4. **Tech Stack**: key vendor technologies (CRM, Marketing/HR/Financial platforms) found in job postings or engineering blogs.
+Paid/vendor tech ONLY - DO NOT list open source or common frameworks.
+
+Return ONLY a JSON object (no code fences, no extra keys) with exactly these four keys,
+each a markdown string: news_data, competitor_data, metrics_data, techstack_data.
 """
 LEAD_INSTRUCTION = """
 You are an Executive Profiler. Research the specific prospect.
@@ -139,8 +211,7 @@ Your goal is to map the prospect's needs to Google Cloud's AI portfolio.
 - Lead Profile: {{lead_data}}
 **Your Tasks:**
 1. **Analyze Research**: Identify 2-3 key pain points or opportunities based on their size, stack, and recent news.
-2. **Fetch Knowledge**: Use the `load_web_page` tool to read the "101 Real World Gen AI Use Cases" page:
-   URL: {GC_USE_CASES_URL}
+2. **Knowledge Base**: The "101 Real World Gen AI Use Cases" page content is provided at the bottom of this prompt.
 3. **Select Case Studies**: From the page content, find the 3 most relevant case studies that match this prospect's industry or pain points.
 4. **Formulate Strategy**:
    - How does Google Cloud (Vertex AI, Gemini, NotebookLM, etc.) solve their specific problems?
@@ -154,6 +225,9 @@ Your goal is to map the prospect's needs to Google Cloud's AI portfolio.
 1. [Company Name]: [Why it's relevant to this prospect]
 2. ...
 3. ...
+
+**Use Cases Page Content:**
+{{gc_usecases_text}}
 """
 OUTREACH_INSTRUCTION = f"""
 You are a Senior Sales Copywriter.
@@ -177,47 +251,247 @@ Return ONLY the email and call script text, nothing else.
 """
 
 # --- 2. Helper Functions ---
+# The use-cases page is static, so its text is cached on disk across runs
+# and refreshed at most once a day.
+_USECASES_CACHE = Path("gc_usecases.txt")
+_USECASES_TTL = 86400
+
+async def get_cached_usecases() -> str:
+    """Returns the use-cases page text, fetching it at most once per day."""
+    try:
+        if time.time() - _USECASES_CACHE.stat().st_mtime < _USECASES_TTL:
+            async with aiofiles.open(_USECASES_CACHE, "r", encoding="utf-8") as f:
+                return await f.read()
+    except FileNotFoundError:
+        pass
+    text = await asyncio.to_thread(load_web_page, GC_USE_CASES_URL)
+    # load_web_page reports errors as a sentinel string instead of raising;
+    # never persist one, or a transient 4xx/5xx would poison positioning
+    # for a full day.
+    if not text or text.startswith("Failed to fetch url"):
+        raise RuntimeError(f"Use-cases page fetch failed: {text[:100]!r}")
+    # Write atomically so a crash mid-write never leaves a truncated cache.
+    tmp_path = _USECASES_CACHE.with_suffix(".tmp")
+    async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+        await f.write(text)
+    os.replace(tmp_path, _USECASES_CACHE)
+    return text
+
+# API hosts contacted on the hot path. Only DNS is prewarmed: the client
+# stacks (google-genai, httpx inside the mcp SDK) do their own TLS
+# handshakes, so a connection opened here would not be reused by them —
+# the resolver cache is the only state they share with us.
+_PREWARM_HOSTS = ("mcp.exa.ai", "generativelanguage.googleapis.com")
+
+async def _prewarm_host(host: str) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+        await asyncio.wait_for(loop.getaddrinfo(host, 443), timeout=2)
+    except Exception:
+        pass  # best-effort: a cold first call is just the status quo
+
+async def prewarm_endpoints() -> None:
+    """Warms the OS resolver cache for each API host."""
+    await asyncio.gather(*(_prewarm_host(host) for host in _PREWARM_HOSTS))
+
+# Tools enabled on the Exa MCP server. The list is constant, so its
+# URL-encoded form is computed once at import rather than per call.
+_EXA_ENABLED_TOOLS_QS = urllib.parse.quote(orjson.dumps(["linkedin_search", "web_search_exa"]))
+
+# Process-wide toolset instance so every tool call shares one MCP session
+# (and one TLS connection) instead of paying a handshake per call.
+_exa_toolset: Optional[MCPToolset] = None
+
 def create_exa_toolset() -> Optional[MCPToolset]:
-    """Initializes the Exa MCP toolset if the API key is present."""
+    """Initializes the Exa MCP toolset if the API key is present.
+
+    Created once per process and reused: ADK's MCP session manager keeps the
+    underlying streamable-HTTP session alive across calls, so
+    linkedin_search and web_search_exa reuse the same connection.
+    """
+    global _exa_toolset
+    if _exa_toolset is not None:
+        return _exa_toolset
+
     exa_api_key = os.environ.get("EXA_API_KEY", "")
     if not exa_api_key:
         logger.warning("EXA_API_KEY not set. LeadProfiler will default to Google Search.")
         return None
-    # 1. Encode enabled tools
-    enabled_tools = ["linkedin_search", "web_search_exa"]
-    encoded_tools = urllib.parse.quote(json.dumps(enabled_tools))
-    
-    # 2. Construct URL
-    exa_url = f"https://mcp.exa.ai/mcp?exaApiKey={exa_api_key}&enabledTools={encoded_tools}"
-    
-    # 3. Create toolset with StreamableHTTPServerParams
-    return MCPToolset(
+    # 1. Construct URL with the precomputed enabled-tools query string
+    exa_url = f"https://mcp.exa.ai/mcp?exaApiKey={exa_api_key}&enabledTools={_EXA_ENABLED_TOOLS_QS}"
+
+    # 2. Create toolset with StreamableHTTPServerParams
+    _exa_toolset = MCPToolset(
         connection_params=StreamableHTTPServerParams(url=exa_url)
     )
+    return _exa_toolset
+
+_TEMPLATE_SPLIT = re.compile(r"\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
+
+def _compile_instruction(template: str):
+    """Pre-splits a {state_key} template into segments at import time.
 
-def build_agents(exa_toolset: Optional[MCPToolset]) -> SequentialAgent:
+    Returns an ADK InstructionProvider that renders with a linear join over
+    the cached segments, so the 2KB+ instructions are not regex-parsed for
+    state interpolation on every model turn.
+    """
+    # Even indices are literals, odd indices are state keys.
+    parts = _TEMPLATE_SPLIT.split(template)
+
+    def provider(ctx: ReadonlyContext) -> str:
+        state = ctx.state
+        return "".join(
+            part if i % 2 == 0 else str(state.get(part, ""))
+            for i, part in enumerate(parts)
+        )
+    return provider
+
+
+# Shared config for Google-Search-backed research agents, bound once at
+# import. MappingProxyType keeps it read-only so per-agent overrides have
+# to be explicit dict merges rather than silent mutation.
+_SEARCH_AGENT_CONFIG = MappingProxyType({
+    "model": MODEL_NAME,
+    "tools": [google_search],
+    "disallow_transfer_to_parent": True,
+    "disallow_transfer_to_peers": True,
+    "before_agent_callback": [skip_if_cached, on_agent_start],
+    "after_agent_callback": on_agent_end,
+    "before_tool_callback": on_tool_start,
+    "before_model_callback": llm_cache.lookup,
+    "after_model_callback": llm_cache.store
+})
+
+
+class LeadResearchPipeline(BaseAgent):
+    """Root orchestrator that overlaps independent stages of the pipeline.
+
+    Two overlaps shave off critical-path latency:
+    - The static "101 Gen AI Use Cases" page is fetched concurrently with
+      the research phase instead of inside PositioningStrategist.
+    - PositioningStrategist starts as soon as CompanyResearcher's output
+      lands, hiding the slower LeadResearcher (Exa) behind positioning LLM
+      time. Until the real profile arrives, lead_data holds a placeholder;
+      OutreachWriter interpolates state only after everything has resolved,
+      so the email always uses the real profile.
+
+    All sub-agents deliberately share one event loop. Fanning them out to
+    per-thread loops (e.g. on free-threaded Python) was evaluated and
+    rejected: the shared InvocationContext and this pipeline's event queue
+    are bound to the loop that created them, and the workload is
+    network-bound, so extra threads buy nothing here.
+    """
+
+    research_team: ParallelAgent
+    positioning_agent: LlmAgent
+    outreach_agent: LlmAgent
+
+    def __init__(self, *, name: str, research_team: ParallelAgent,
+                 positioning_agent: LlmAgent, outreach_agent: LlmAgent, **kwargs):
+        super().__init__(
+            name=name,
+            research_team=research_team,
+            positioning_agent=positioning_agent,
+            outreach_agent=outreach_agent,
+            sub_agents=[research_team, positioning_agent, outreach_agent],
+            **kwargs
+        )
+
+    async def _pump(self, agent: BaseAgent, ctx: InvocationContext,
+                    queue: asyncio.Queue) -> None:
+        """Forwards an agent's events into the shared queue, then a sentinel."""
+        try:
+            async for event in agent.run_async(ctx):
+                await queue.put(event)
+        finally:
+            await queue.put(None)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        # Kick off the page load; on a cache miss it downloads while research runs.
+        prefetch = asyncio.create_task(get_cached_usecases())
+
+        queue: asyncio.Queue = asyncio.Queue()
+        tasks = [asyncio.create_task(self._pump(self.research_team, ctx, queue))]
+        positioning_started = False
+
+        async def run_positioning() -> None:
+            try:
+                ctx.session.state["gc_usecases_text"] = await prefetch
+            except Exception as e:
+                logger.warning(f"Use-cases fetch failed, positioning proceeds without it: {e}")
+                ctx.session.state["gc_usecases_text"] = ""
+            if not ctx.session.state.get("lead_data"):
+                # Placeholder so instruction interpolation succeeds while
+                # LeadResearcher is still running; the real profile lands in
+                # state before OutreachWriter reads it.
+                ctx.session.state["lead_data"] = _LEAD_PENDING_PLACEHOLDER
+            await self._pump(self.positioning_agent, ctx, queue)
+
+        try:
+            running = len(tasks)
+            while running:
+                event = await queue.get()
+                if event is None:
+                    running -= 1
+                    continue
+                yield event
+
+                # Speculation trigger: fan_out_research has split the company
+                # research into the keys positioning interpolates, so it can
+                # start without waiting for the slower LeadResearcher. Waiting
+                # for research_data alone isn't enough — the fan-out keys land
+                # in a later event, and positioning would render them empty.
+                delta = event.actions.state_delta if event.actions else {}
+                if not positioning_started and "news_data" in delta:
+                    # Commit the delta locally; the runner may not have yet.
+                    ctx.session.state.update(delta)
+                    tasks.append(asyncio.create_task(run_positioning()))
+                    positioning_started = True
+                    running += 1
+
+            if not positioning_started:
+                # Research never produced research_data (e.g. hard failure);
+                # degrade to the sequential path rather than skip positioning.
+                tasks.append(asyncio.create_task(run_positioning()))
+                running = 1
+                while running:
+                    event = await queue.get()
+                    if event is None:
+                        running -= 1
+                        continue
+                    yield event
+
+            # Surface any exception swallowed inside the pump tasks.
+            await asyncio.gather(*tasks)
+
+            async for event in self.outreach_agent.run_async(ctx):
+                yield event
+        finally:
+            # If the consumer closes the generator early (GeneratorExit at a
+            # yield), don't leave the prefetch or pump tasks dangling.
+            pending = [task for task in (prefetch, *tasks) if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+def build_agents(exa_toolset: Optional[MCPToolset]) -> LeadResearchPipeline:
     """Constructs the agent team hierarchy."""
     
-    # Web Loader Tool
-    web_loader_tool = FunctionTool(load_web_page)
-    # Common Config
-    search_agent_config = {
-        "model": MODEL_NAME,
-        "tools": [google_search],
-        "disallow_transfer_to_parent": True,
-        "disallow_transfer_to_peers": True,
-        "before_agent_callback": on_agent_start,
-        "after_agent_callback": on_agent_end,
-        "before_tool_callback": on_tool_start
-    }
+    # Company Researcher: one agent covers news/competitors/metrics/stack in
+    # a single model round-trip; fan_out_research splits the JSON into the
+    # four state keys the downstream instructions expect.
+    company_agent = LlmAgent(
+        name="CompanyResearcher",
+        instruction=COMPANY_RESEARCH_INSTRUCTION,
+        output_key="research_data",
+        **{**_SEARCH_AGENT_CONFIG, "after_agent_callback": [fan_out_research, on_agent_end]}
+    )
 
-    # Research Specialists
-    news_agent = LlmAgent(name="NewsResearcher", instruction=NEWS_INSTRUCTION, output_key="news_data", **search_agent_config)
-    competitor_agent = LlmAgent(name="CompetitorResearcher", instruction=COMPETITOR_INSTRUCTION, output_key="competitor_data", **search_agent_config)
-    metrics_agent = LlmAgent(name="MetricsResearcher", instruction=METRICS_INSTRUCTION, output_key="metrics_data", **search_agent_config)
-    techstack_agent = LlmAgent(name="TechStackResearcher", instruction=TECHSTACK_INSTRUCTION, output_key="techstack_data", **search_agent_config)
-    
     # Lead Researcher (Uses Exa if available)
+    # ADK already runs the tool calls of one model turn concurrently, so
+    # linkedin_search and web_search_exa overlap without extra config.
     lead_agent = LlmAgent(
         name="LeadResearcher",
         model=MODEL_NAME,
@@ -226,15 +500,17 @@ def build_agents(exa_toolset: Optional[MCPToolset]) -> SequentialAgent:
         tools=[exa_toolset] if exa_toolset else [google_search],
         disallow_transfer_to_parent=True,
         disallow_transfer_to_peers=True,
-        before_agent_callback=on_agent_start,
+        before_agent_callback=[skip_if_cached, on_agent_start],
         after_agent_callback=on_agent_end,
-        before_tool_callback=on_tool_start
+        before_tool_callback=on_tool_start,
+        before_model_callback=llm_cache.lookup,
+        after_model_callback=llm_cache.store
     )
 
     # Parallel Team
     parallel_research_team = ParallelAgent(
         name="ParallelResearchTeam",
-        sub_agents=[news_agent, competitor_agent, metrics_agent, techstack_agent, lead_agent],
+        sub_agents=[company_agent, lead_agent],
         before_agent_callback=on_agent_start,
         after_agent_callback=on_agent_end
     )
@@ -243,31 +519,32 @@ def build_agents(exa_toolset: Optional[MCPToolset]) -> SequentialAgent:
     positioning_agent = LlmAgent(
         name="PositioningStrategist",
         model=MODEL_NAME,
-        instruction=POSITIONING_INSTRUCTION,
+        instruction=_compile_instruction(POSITIONING_INSTRUCTION),
         output_key="positioning_strategy",
-        tools=[web_loader_tool],
-        before_agent_callback=on_agent_start,
+        before_agent_callback=[skip_if_cached, on_agent_start],
         after_agent_callback=on_agent_end,
-        before_tool_callback=on_tool_start
+        before_tool_callback=on_tool_start,
+        before_model_callback=llm_cache.lookup,
+        after_model_callback=llm_cache.store
     )
 
     # Outreach Writer
     outreach_agent = LlmAgent(
         name="OutreachWriter",
         model=MODEL_NAME,
-        instruction=OUTREACH_INSTRUCTION,
+        instruction=_compile_instruction(OUTREACH_INSTRUCTION),
         before_agent_callback=on_agent_start,
-        after_agent_callback=on_agent_end
+        after_agent_callback=on_agent_end,
+        before_model_callback=llm_cache.lookup,
+        after_model_callback=llm_cache.store
     )
 
     # Root Orchestrator
-    return SequentialAgent(
+    return LeadResearchPipeline(
         name="LeadResearchSystem",
-        sub_agents=[
-            parallel_research_team,
-            positioning_agent,     
-            outreach_agent         
-        ],
+        research_team=parallel_research_team,
+        positioning_agent=positioning_agent,
+        outreach_agent=outreach_agent,
         before_agent_callback=on_agent_start,
         after_agent_callback=on_agent_end
     )
@@ -279,8 +556,19 @@ async def main():
         print("Error: GOOGLE_API_KEY not found.")
         return
     
-    # Initialize Resources INSIDE the async loop to prevent context errors
-    session_service = InMemorySessionService()
+    # Warm DNS for the API hosts while the rest of setup runs
+    prewarm_task = asyncio.create_task(prewarm_endpoints())
+    log_drain_task = asyncio.create_task(_drain_log_queue())
+
+    # Initialize Resources INSIDE the async loop to prevent context errors.
+    # Sessions are persisted per (prospect, day), so a same-day rerun for the
+    # same prospect resumes with the previous research already in state.
+    session_cache_key = f"{PROSPECT_COMPANY}:{PROSPECT_NAME}:{time.strftime('%Y-%m-%d')}"
+    # gc_usecases_text is ~100KB and already cached in gc_usecases.txt, so
+    # keep it out of the per-delta state snapshots.
+    session_service = SQLiteSessionService(
+        "sessions.db", cache_key=session_cache_key, exclude_keys=("gc_usecases_text",)
+    )
     await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
     
     # Create Tools & Agents
@@ -295,35 +583,93 @@ async def main():
     print(f"TARGET: {user_query}\n")
     
     content = types.Content(role='user', parts=[types.Part(text=user_query)])
+    # Stream model output so the draft hits disk while tokens are still arriving
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+    filename = "sales_outreach.md"
+    output_path = os.path.abspath(filename)
+    outreach_file = None
+    outreach_open_task = None
+
+    async def open_outreach_file():
+        # Reuse the handle opened eagerly when positioning finished, if any.
+        if outreach_open_task is not None:
+            return await outreach_open_task
+        return await aiofiles.open(filename, "w", encoding="utf-8")
+
     try:
-        async for event in runner.run_async(user_id=USER_ID, session_id=SESSION_ID, new_message=content):
-            if event.is_final_response() and event.content:
+        async for event in runner.run_async(user_id=USER_ID, session_id=SESSION_ID,
+                                            new_message=content, run_config=run_config):
+            text = None
+            if event.content and event.content.parts:
+                text = event.content.parts[0].text
+
+            if event.author == "OutreachWriter" and event.partial and text:
+                # Append each partial chunk as it arrives; the file is
+                # complete by the time the final event lands.
+                if outreach_file is None:
+                    outreach_file = await open_outreach_file()
+                    outreach_open_task = None
+                await outreach_file.write(text)
+
+            elif event.is_final_response() and event.content:
                 if event.author == "OutreachWriter":
-                    final_text = event.content.parts[0].text
+                    final_text = text or ""
+
+                    if outreach_file is None:
+                        # Nothing was streamed (e.g. cached response):
+                        # write the whole draft in one go.
+                        outreach_file = await open_outreach_file()
+                        outreach_open_task = None
+                        await outreach_file.write(final_text)
+                    write_task = asyncio.create_task(outreach_file.close())
+                    outreach_file = None
 
                     print(f"\n================================================================")
                     print(f"📧 FINAL OUTREACH DRAFT")
                     print(f"================================================================\n")
                     print(final_text)
-                    
-                    # Save to file
-                    filename = "sales_outreach.md"
-                    with open(filename, "w", encoding="utf-8") as f:
-                        f.write(final_text)
-                    print(f"\n✅ Saved outreach draft to: {os.path.abspath(filename)}")
-                
+
+                    await write_task
+                    print(f"\n✅ Saved outreach draft to: {output_path}")
+
                 elif event.author == "PositioningStrategist":
+                    # OutreachWriter runs next: open its output file now so
+                    # the first streamed chunk is a bare write() with no
+                    # open/path resolution left on the critical path.
+                    if outreach_open_task is None:
+                        outreach_open_task = asyncio.create_task(
+                            aiofiles.open(filename, "w", encoding="utf-8"))
                     print(f"\n[DEBUG] Positioning Strategy Generated...\n")
     finally:
-        # Cleanup MCP toolset if it was created
+        # Run cleanup steps concurrently; shield them so a stray
+        # cancellation can't cut the MCP shutdown handshake short.
+        log_drain_task.cancel()
+        cleanup = [llm_cache.close(), session_service.close(), prewarm_task]
+        if outreach_file is not None:
+            cleanup.append(outreach_file.close())
+        if outreach_open_task is not None:
+            # The eagerly opened handle was never consumed; close it too.
+            async def _close_preopened(task=outreach_open_task):
+                f = await task
+                await f.close()
+            cleanup.append(_close_preopened())
         if exa_toolset:
             print("\nClosing Exa toolset connection...")
-            try:
-                await exa_toolset.close()
-            except Exception as e:
-                logger.warning(f"Error during toolset cleanup: {e}")
+            cleanup.append(exa_toolset.close())
+        results = await asyncio.shield(asyncio.gather(*cleanup, return_exceptions=True))
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Error during cleanup: {result}")
         
 if __name__ == "__main__":
+    # uvloop cuts asyncio scheduler overhead noticeably on this
+    # syscall-heavy workload; fall back to the default loop without it.
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,88 @@
+"""Session services tuned for the parallel research workload.
+
+InMemorySessionService's state appends are plain dict work on a single
+event loop, so parallel agents writing disjoint output keys never contend;
+no extra locking is needed here. What the stock service lacks is
+persistence, which SQLiteSessionService adds.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional
+
+import aiosqlite
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+
+
+class SQLiteSessionService(InMemorySessionService):
+    """Session service that persists state snapshots to SQLite.
+
+    Snapshots are keyed by a caller-supplied cache key (prospect company,
+    prospect name, date), so re-running the pipeline for the same prospect
+    on the same day restores the previous run's research outputs. Agents
+    whose output keys are already populated can then be skipped via a
+    before-agent callback, collapsing a repeat run to just the missing
+    steps.
+    """
+
+    def __init__(self, db_path: str = "sessions.db", cache_key: str = "",
+                 exclude_keys: Iterable[str] = ()):
+        super().__init__()
+        self._db_path = db_path
+        self._cache_key = cache_key
+        # State keys that are cheap to re-derive (or cached elsewhere) and
+        # therefore not worth serializing into every snapshot.
+        self._exclude_keys = frozenset(exclude_keys)
+        self._db: Optional[aiosqlite.Connection] = None
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._db is None:
+            self._db = await aiosqlite.connect(self._db_path)
+            await self._db.execute(
+                "CREATE TABLE IF NOT EXISTS session_state ("
+                "cache_key TEXT PRIMARY KEY, state TEXT NOT NULL)"
+            )
+            await self._db.commit()
+        return self._db
+
+    async def create_session(self, *, app_name: str, user_id: str,
+                             state: Optional[Dict[str, Any]] = None,
+                             session_id: Optional[str] = None) -> Session:
+        db = await self._connection()
+        async with db.execute(
+            "SELECT state FROM session_state WHERE cache_key = ?", (self._cache_key,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row:
+            # Seed the new session with the previous run's outputs.
+            restored = {
+                key: value for key, value in json.loads(row[0]).items()
+                if key not in self._exclude_keys
+            }
+            state = {**restored, **(state or {})}
+        return await super().create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        result = await super().append_event(session, event)
+        state_delta = event.actions.state_delta if event.actions else {}
+        if state_delta:
+            snapshot = {
+                key: value
+                for key, value in {**session.state, **state_delta}.items()
+                if not key.startswith(("temp:", "_")) and key not in self._exclude_keys
+            }
+            db = await self._connection()
+            await db.execute(
+                "INSERT OR REPLACE INTO session_state (cache_key, state) VALUES (?, ?)",
+                (self._cache_key, json.dumps(snapshot, default=str)),
+            )
+            await db.commit()
+        return result
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None